@@ -2,87 +2,179 @@
 import numpy as np
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives.kdf.hkdf import HKDF
-from typing import Tuple, Dict, List, Optional
-import secrets
+from typing import Tuple, Dict, Optional
+import hmac
+import os
+import queue
+import threading
 
 class QuantumKeyDistribution:
     def __init__(self):
-        self.basis_sets = {
-            'rectilinear': [0, 90],  # degrees
-            'diagonal': [45, 135]     # degrees
-        }
+        # Rows are basis IDs (0 = rectilinear, 1 = diagonal), columns are bit values
+        self.basis_sets = np.array([
+            [0, 90],   # rectilinear, degrees
+            [45, 135]  # diagonal, degrees
+        ], dtype=np.float32)
         self.error_rate_threshold = 0.15
 
-    def generate_random_bits(self, num_bits: int) -> List[int]:
+    def _random_bit_array(self, num_bits: int) -> np.ndarray:
+        """Draw num_bits uniform random bits, unpacked from eight bits per CSPRNG byte."""
+        packed = np.frombuffer(os.urandom((num_bits + 7) // 8), dtype=np.uint8)
+        return np.unpackbits(packed, count=num_bits)
+
+    def generate_random_bits(self, num_bits: int) -> np.ndarray:
         """Generate random bits for QKD."""
         try:
-            return [secrets.randbelow(2) for _ in range(num_bits)]
+            return self._random_bit_array(num_bits)
         except Exception as e:
             print(f"Error generating random bits: {e}")
-            return []
+            return np.empty(0, dtype=np.uint8)
 
-    def choose_random_bases(self, num_bits: int) -> List[str]:
-        """Choose random bases for encoding/measuring qubits."""
+    def choose_random_bases(self, num_bits: int) -> np.ndarray:
+        """Choose random basis IDs (0 = rectilinear, 1 = diagonal) for encoding/measuring qubits."""
         try:
-            bases = ['rectilinear', 'diagonal']
-            return [secrets.choice(bases) for _ in range(num_bits)]
+            return self._random_bit_array(num_bits)
         except Exception as e:
             print(f"Error choosing random bases: {e}")
-            return []
+            return np.empty(0, dtype=np.uint8)
 
-    def encode_bits(self, bits: List[int], bases: List[str]) -> List[float]:
-        """Encode bits using the chosen bases."""
+    def generate_bits_and_bases(self, num_bits: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate random bits and basis IDs together from a single CSPRNG draw."""
         try:
-            qubits = []
-            for bit, basis in zip(bits, bases):
-                angle = self.basis_sets[basis][bit]
-                qubits.append(angle)
-            return qubits
+            buf = self._random_bit_array(2 * num_bits)
+            return buf[:num_bits], buf[num_bits:]
         except Exception as e:
-            print(f"Error encoding bits: {e}")
-            return []
+            print(f"Error generating bits and bases: {e}")
+            return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.uint8)
 
-    def measure_qubits(self, qubits: List[float], bases: List[str]) -> List[int]:
+    def encode_bits(self, bits: np.ndarray, bases: np.ndarray) -> np.ndarray:
+        """Encode bits using the chosen bases."""
+        return self.basis_sets[bases, bits]
+
+    def measure_qubits(self, qubits: np.ndarray, bases: np.ndarray) -> np.ndarray:
         """Measure qubits using the chosen bases."""
-        try:
-            measurements = []
-            for qubit, basis in zip(qubits, bases):
-                if basis == 'rectilinear':
-                    closest = min(self.basis_sets[basis], key=lambda x: abs(x - qubit))
-                    measurements.append(self.basis_sets[basis].index(closest))
-                else:
-                    closest = min(self.basis_sets[basis], key=lambda x: abs(x - qubit))
-                    measurements.append(self.basis_sets[basis].index(closest))
-            return measurements
-        except Exception as e:
-            print(f"Error measuring qubits: {e}")
-            return []
+        # Each basis has only two angles, so pick the closer one directly
+        qubits = np.asarray(qubits)
+        closer_to_one = np.abs(qubits - self.basis_sets[bases, 1]) < np.abs(qubits - self.basis_sets[bases, 0])
+        return closer_to_one.astype(np.uint8)
 
-    def sift_key(self, bits: List[int], bases1: List[str], bases2: List[str]) -> Tuple[List[int], float]:
+    def sift_key(self, bits: np.ndarray, bases1: np.ndarray, bases2: np.ndarray) -> Tuple[np.ndarray, float]:
         """Sift the key by keeping only bits where bases match."""
+        mask = np.asarray(bases1) == np.asarray(bases2)
+        sifted_key = np.asarray(bits)[mask]
+        error_rate = 0  # In real implementation, estimate error rate
+        return sifted_key, error_rate
+
+class _PrivateKeyPool:
+    """Bounded pool of private keys for one curve, refilled by a stoppable background thread."""
+
+    def __init__(self, curve: ec.EllipticCurve, size: int):
+        self.curve = curve
+        self.size = size
+        self._reset()
+
+    def _reset(self):
+        """Drop all pooled keys and refill state without touching the (possibly dead) thread."""
+        self._keys = queue.Queue(maxsize=self.size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _refill(self, stop: threading.Event):
+        """Keep the pool topped up with fresh private keys until stop is set."""
+        key = None
+        while not stop.is_set():
+            if key is None:
+                key = ec.generate_private_key(self.curve)
+            try:
+                self._keys.put(key, timeout=0.5)
+                key = None
+            except queue.Full:
+                pass
+
+    def get(self) -> ec.EllipticCurvePrivateKey:
+        """Pop a precomputed private key, falling back to generating one inline."""
+        with self._lock:
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._refill, args=(self._stop,), daemon=True)
+                self._thread.start()
         try:
-            sifted_key = []
-            for i in range(len(bits)):
-                if bases1[i] == bases2[i]:
-                    sifted_key.append(bits[i])
-            error_rate = 0  # In real implementation, estimate error rate
-            return sifted_key, error_rate
-        except Exception as e:
-            print(f"Error sifting key: {e}")
-            return [], 1.0
+            return self._keys.get_nowait()
+        except queue.Empty:
+            return ec.generate_private_key(self.curve)
+
+    def close(self):
+        """Stop the refill thread and discard any pooled keys."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+        if thread is not None:
+            thread.join()
+        while True:
+            try:
+                self._keys.get_nowait()
+            except queue.Empty:
+                break
 
 class QuantumResistantCrypto:
-    def __init__(self):
+    # One key pool per (curve, size), shared by every instance so repeated
+    # channels draw from the same warm pool instead of each starting a thread
+    _key_pools: Dict[Tuple[str, int], _PrivateKeyPool] = {}
+    _key_pools_lock = threading.Lock()
+
+    def __init__(self, curve: Optional[ec.EllipticCurve] = None, key_pool_size: int = 16):
         try:
-            self.curve = ec.SECP384R1()
+            # SECP384R1 by default; SECP256R1 gives much faster keygen/ECDH where
+            # 192-bit security is not required
+            self.curve = curve if curve is not None else ec.SECP384R1()
+            # Pair the KDF hash strength with the curve (SHA-384 for P-384)
+            self.hash_algorithm = hashes.SHA384() if self.curve.key_size >= 384 else hashes.SHA256()
+            self._key_pool = self._shared_key_pool(self.curve, key_pool_size) if key_pool_size > 0 else None
         except Exception as e:
             print(f"Error initializing QuantumResistantCrypto: {e}")
 
+    @classmethod
+    def _shared_key_pool(cls, curve: ec.EllipticCurve, size: int) -> _PrivateKeyPool:
+        """Return the shared key pool for this curve and size, creating it on first use."""
+        with cls._key_pools_lock:
+            pool = cls._key_pools.get((curve.name, size))
+            if pool is None:
+                pool = _PrivateKeyPool(curve, size)
+                cls._key_pools[(curve.name, size)] = pool
+            return pool
+
+    @classmethod
+    def close_key_pools(cls):
+        """Stop all background key generation and discard pooled keys."""
+        with cls._key_pools_lock:
+            pools = list(cls._key_pools.values())
+            cls._key_pools.clear()
+        for pool in pools:
+            pool.close()
+
+    @classmethod
+    def _reset_key_pools_after_fork(cls):
+        """Empty every key pool in a freshly forked child process."""
+        # The child inherits a copy of the parent's pooled private keys but not
+        # its refill threads; handing those keys out would reuse the same ECDH
+        # private keys in both processes, so every pool starts over empty
+        cls._key_pools_lock = threading.Lock()
+        pools = list(cls._key_pools.values())
+        cls._key_pools.clear()
+        for pool in pools:
+            pool._reset()
+
+    def _next_private_key(self) -> ec.EllipticCurvePrivateKey:
+        """Pop a precomputed private key, falling back to generating one inline."""
+        if self._key_pool is None:
+            return ec.generate_private_key(self.curve)
+        return self._key_pool.get()
+
     def generate_keypair(self) -> Tuple[Optional[ec.EllipticCurvePrivateKey], Optional[ec.EllipticCurvePublicKey]]:
         """Generate quantum-resistant keypair."""
         try:
-            private_key = ec.generate_private_key(self.curve)
+            private_key = self._next_private_key()
             public_key = private_key.public_key()
             return private_key, public_key
         except Exception as e:
@@ -94,17 +186,19 @@ class QuantumResistantCrypto:
         """Derive shared key using quantum-resistant algorithm."""
         try:
             shared_key = private_key.exchange(ec.ECDH(), peer_public_key)
-            derived_key = HKDF(
-                algorithm=hashes.SHA384(),
-                length=32,
-                salt=None,
-                info=b'messium-agri-ai-key'
-            ).derive(shared_key)
+            # HKDF (RFC 5869) with an all-zero salt; a 32-byte output fits in a
+            # single HMAC block for SHA-256/384, so one expand round suffices
+            digest = self.hash_algorithm.name
+            prk = hmac.new(b'\x00' * self.hash_algorithm.digest_size, shared_key, digest).digest()
+            derived_key = hmac.new(prk, b'messium-agri-ai-key\x01', digest).digest()[:32]
             return derived_key
         except Exception as e:
             print(f"Error deriving key: {e}")
             return None
 
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=QuantumResistantCrypto._reset_key_pools_after_fork)
+
 class SecureQuantumChannel:
     def __init__(self):
         try:
@@ -117,8 +211,7 @@ class SecureQuantumChannel:
         """Establish secure connection using QKD and quantum-resistant crypto."""
         try:
             # QKD Protocol
-            alice_bits = self.qkd.generate_random_bits(num_bits)
-            alice_bases = self.qkd.choose_random_bases(num_bits)
+            alice_bits, alice_bases = self.qkd.generate_bits_and_bases(num_bits)
             qubits = self.qkd.encode_bits(alice_bits, alice_bases)
         
             # Bob's measurements
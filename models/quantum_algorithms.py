@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
 import numpy as np
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, execute, Aer
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
 from qiskit.algorithms import VQE, QAOA
+from qiskit.circuit import ParameterVector
 from qiskit.circuit.library import EfficientSU2
+from qiskit_aer import AerSimulator
 
 class QuantumOptimizer:
-    def __init__(self):
-        self.backend = Aer.get_backend('aer_simulator')
+    def __init__(self, rng=None, precision='double'):
+        # precision='single' halves statevector memory traffic; shot counts are
+        # sampled from |psi|^2, so float32 amplitudes are usually enough
+        self.backend = AerSimulator(method='statevector', precision=precision)
+        # Pass a seeded np.random.Generator for reproducible shot counts
+        self._rng = rng if rng is not None else np.random.default_rng()
+        # Transpiled circuit templates, keyed by method and circuit shape
+        self._transpiled = {}
 
     def create_quantum_circuit(self, num_qubits):
         """Create a quantum circuit with specified number of qubits."""
@@ -15,26 +23,70 @@ class QuantumOptimizer:
         circuit = QuantumCircuit(qr, cr)
         return circuit
 
+    def _get_transpiled(self, key, build_circuit):
+        """Return the transpiled circuit for key, building and transpiling it on first use."""
+        circuit = self._transpiled.get(key)
+        if circuit is None:
+            circuit = transpile(build_circuit(), self.backend, optimization_level=3)
+            self._transpiled[key] = circuit
+        return circuit
+
+    def _sample_counts(self, circuit, num_qubits, shots=1000):
+        """Simulate the circuit's statevector once and sample measurement counts from it."""
+        result = self.backend.run(circuit, shots=1).result()
+        psi = np.asarray(result.get_statevector())
+        # |psi|^2 as re^2 + im^2 accumulated into one float64 buffer (no sqrt via np.abs)
+        probs = np.square(psi.real, dtype=np.float64)
+        probs += np.square(psi.imag)
+        probs /= probs.sum()
+    
+        # One multinomial draw replaces per-shot measurement simulation
+        samples = self._rng.multinomial(shots, probs)
+        return {
+            format(index, f'0{num_qubits}b'): int(samples[index])
+            for index in np.flatnonzero(samples)
+        }
+
+    def _annealing_circuit(self, num_qubits):
+        """Build the quantum annealing circuit template."""
+        circuit = self.create_quantum_circuit(num_qubits)
+    
+        # Prepare initial superposition
+        circuit.h(range(num_qubits))
+    
+        # Placeholder for the annealing schedule; problem-specific gates for
+        # each of the num_steps steps go here once a cost Hamiltonian is wired in
+        circuit.barrier()
+    
+        circuit.save_statevector()
+        return circuit
+
+    def _ml_pattern_circuit(self, num_qubits):
+        """Build the parameterized pattern recognition circuit template."""
+        circuit = self.create_quantum_circuit(num_qubits)
+        features = ParameterVector('x', num_qubits)
+    
+        # Encode data into quantum states
+        for i in range(num_qubits):
+            circuit.rx(features[i], i)
+    
+        # Add entangling layers
+        for i in range(num_qubits-1):
+            circuit.cx(i, i+1)
+    
+        circuit.save_statevector()
+        return circuit
+
     def quantum_annealing(self, cost_function, num_qubits=4, num_steps=100):
         try:
             """Implement quantum annealing for optimization."""
-            circuit = self.create_quantum_circuit(num_qubits)
-        
-            # Prepare initial superposition
-            circuit.h(range(num_qubits))
-        
-            # Add annealing steps
-            for step in range(num_steps):
-                # Add problem-specific gates here
-                circuit.barrier()
-        
-            # Measure qubits
-            circuit.measure(range(num_qubits), range(num_qubits))
+            circuit = self._get_transpiled(
+                ('annealing', num_qubits),
+                lambda: self._annealing_circuit(num_qubits)
+            )
         
             # Execute circuit
-            job = execute(circuit, self.backend, shots=1000)
-            result = job.result()
-            counts = result.get_counts(circuit)
+            counts = self._sample_counts(circuit, num_qubits)
         
             return counts
         except Exception as e:
@@ -58,23 +110,19 @@ class QuantumOptimizer:
     def quantum_ml_pattern(self, data, num_qubits=4):
         try:
             """Implement quantum machine learning for pattern recognition."""
-            circuit = self.create_quantum_circuit(num_qubits)
-        
-            # Encode data into quantum states
-            for i, value in enumerate(data[:num_qubits]):
-                circuit.rx(value, i)
-        
-            # Add entangling layers
-            for i in range(num_qubits-1):
-                circuit.cnot(i, i+1)
+            template = self._get_transpiled(
+                ('ml_pattern', num_qubits),
+                lambda: self._ml_pattern_circuit(num_qubits)
+            )
         
-            # Measure qubits
-            circuit.measure(range(num_qubits), range(num_qubits))
+            # Bind data to the rotation angles; qubits without data get rx(0)
+            values = np.zeros(num_qubits)
+            encoded = np.asarray(data[:num_qubits], dtype=float)
+            values[:len(encoded)] = encoded
+            circuit = template.assign_parameters(values)
         
             # Execute circuit
-            job = execute(circuit, self.backend, shots=1000)
-            result = job.result()
-            counts = result.get_counts(circuit)
+            counts = self._sample_counts(circuit, num_qubits)
         
             return counts
         except Exception as e:
@@ -1,30 +1,45 @@
 #!/usr/bin/env python3
+import math
 import numpy as np
-from scipy import signal
-from typing import Dict, List, Tuple
+from scipy.signal import fftconvolve
+from typing import Dict, Optional, Tuple
 
 class QuantumSensor:
-    def __init__(self):
+    def __init__(self, rng: Optional[np.random.Generator] = None):
         self.sensitivity = 1e-12  # Default sensitivity in Tesla for magnetometers
+        # Pass one Generator to several sensors to share a single RNG stream
+        self._rng = rng if rng is not None else np.random.default_rng()
+        self._noise_buf = None
 
     def set_sensitivity(self, sensitivity: float):
         """Set the sensitivity of the quantum sensor."""
         self.sensitivity = sensitivity
 
+    def _add_quantum_noise(self, data: np.ndarray) -> np.ndarray:
+        """Return data plus Gaussian quantum noise, reusing a persistent buffer."""
+        if self._noise_buf is None or self._noise_buf.shape != data.shape:
+            self._noise_buf = np.empty(data.shape)
+        self._rng.standard_normal(out=self._noise_buf)
+        self._noise_buf *= self.sensitivity
+        self._noise_buf += data
+        return self._noise_buf
+
 class QuantumMagnetometer(QuantumSensor):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        super().__init__(rng)
         self.field_range = (-1e-6, 1e-6)  # Tesla
 
     def measure_magnetic_field(self, sample_data: np.ndarray) -> Dict[str, float]:
         """Simulate quantum magnetometer measurements for soil analysis."""
         # Add quantum noise
-        quantum_noise = np.random.normal(0, self.sensitivity, size=sample_data.shape)
-        measured_field = sample_data + quantum_noise
+        measured_field = self._add_quantum_noise(sample_data)
         
-        # Calculate field properties
-        mean_field = np.mean(measured_field)
-        std_field = np.std(measured_field)
+        # Calculate field properties; the noise buffer is centered in place so the
+        # variance avoids the cancellation of sum-of-squares minus squared mean
+        n = measured_field.size
+        mean_field = measured_field.sum() / n
+        measured_field -= mean_field
+        std_field = math.sqrt(np.vdot(measured_field, measured_field) / n)
         
         return {
             "mean_field": mean_field,
@@ -44,23 +59,23 @@ class QuantumMagnetometer(QuantumSensor):
         }
 
 class QuantumGravimeter(QuantumSensor):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        super().__init__(rng)
         self.sensitivity = 1e-8  # m/s^2
 
     def measure_gravity_field(self, position_data: np.ndarray) -> Dict[str, float]:
         """Simulate quantum gravimeter measurements for water table monitoring."""
         # Add quantum noise
-        quantum_noise = np.random.normal(0, self.sensitivity, size=position_data.shape)
-        measured_gravity = position_data + quantum_noise
+        measured_gravity = self._add_quantum_noise(position_data)
+        mean_gravity = measured_gravity.sum() / measured_gravity.size
         
         # Calculate gravity anomaly
         reference_gravity = 9.81  # m/s^2
-        gravity_anomaly = measured_gravity - reference_gravity
+        gravity_anomaly = mean_gravity - reference_gravity
         
         return {
-            "gravity": np.mean(measured_gravity),
-            "anomaly": np.mean(gravity_anomaly),
+            "gravity": mean_gravity,
+            "anomaly": gravity_anomaly,
             "noise_floor": self.sensitivity
         }
 
@@ -69,7 +84,7 @@ class QuantumGravimeter(QuantumSensor):
             """Estimate water table depth from gravity measurements."""
             # Simple model relating gravity anomaly to water table depth
             density_contrast = 1000  # kg/m^3 (water density)
-            depth = abs(gravity_data["anomaly"]) / (2 * np.pi * 6.67430e-11 * density_contrast)
+            depth = abs(gravity_data["anomaly"]) / (2 * math.pi * 6.67430e-11 * density_contrast)
         
             return {
                 "depth": depth,
@@ -80,30 +95,33 @@ class QuantumGravimeter(QuantumSensor):
             return None
 
 class QuantumRadar:
-    def __init__(self):
+    def __init__(self, rng: Optional[np.random.Generator] = None):
         self.entangled_photons = 1000
         self.wavelength = 1550e-9  # nm (telecommunications wavelength)
+        self._rng = rng if rng is not None else np.random.default_rng()
 
     def generate_entangled_photons(self, num_photons: int) -> Tuple[np.ndarray, np.ndarray]:
         """Simulate generation of entangled photon pairs."""
-        signal = np.random.normal(0, 1, num_photons)
+        signal = self._rng.standard_normal(num_photons)
         idler = -signal  # Perfect anti-correlation
         return signal, idler
 
     def scan_crop(self, area: np.ndarray) -> Dict[str, np.ndarray]:
         """Simulate quantum radar scanning of crops."""
-        # Generate entangled photons
-        signal, idler = self.generate_entangled_photons(self.entangled_photons)
+        # Generate entangled photons; the idler is the exact negation of the
+        # signal, so it is never materialized and its sign is applied below
+        signal = self._rng.standard_normal(self.entangled_photons)
         
         # Simulate interaction with crop
         reflected_signal = signal * area
         
-        # Quantum-enhanced detection
-        coincidence_count = np.correlate(reflected_signal, idler, mode='full')
+        # Quantum-enhanced detection (FFT-based cross-correlation with the idler)
+        coincidence_count = fftconvolve(reflected_signal, signal[::-1], mode='full')
+        np.negative(coincidence_count, out=coincidence_count)
         
         return {
             "image": coincidence_count,
-            "resolution": self.wavelength / np.sqrt(self.entangled_photons)
+            "resolution": self.wavelength / math.sqrt(self.entangled_photons)
         }
 
     def analyze_crop_health(self, scan_data: Dict[str, np.ndarray]) -> Dict[str, float]:
@@ -128,23 +146,26 @@ class QuantumRadar:
 
 # Example usage
 if __name__ == "__main__":
+    # Share one random generator across all sensors
+    rng = np.random.default_rng()
+    
     # Example: Quantum Magnetometer
-    magnetometer = QuantumMagnetometer()
-    sample_field = np.random.normal(0, 1e-7, 100)
+    magnetometer = QuantumMagnetometer(rng)
+    sample_field = rng.normal(0, 1e-7, 100)
     magnetic_data = magnetometer.measure_magnetic_field(sample_field)
     soil_analysis = magnetometer.analyze_soil_composition(magnetic_data)
     print("Soil Analysis:", soil_analysis)
     
     # Example: Quantum Gravimeter
-    gravimeter = QuantumGravimeter()
-    position_data = np.full(100, 9.81) + np.random.normal(0, 1e-6, 100)
+    gravimeter = QuantumGravimeter(rng)
+    position_data = np.full(100, 9.81) + rng.normal(0, 1e-6, 100)
     gravity_data = gravimeter.measure_gravity_field(position_data)
     water_table = gravimeter.estimate_water_table(gravity_data)
     print("Water Table:", water_table)
     
     # Example: Quantum Radar
-    radar = QuantumRadar()
-    crop_area = np.random.uniform(0.5, 1, 100)
+    radar = QuantumRadar(rng)
+    crop_area = rng.uniform(0.5, 1, 100)
     scan_data = radar.scan_crop(crop_area)
     health_data = radar.analyze_crop_health(scan_data)
     print("Crop Health:", health_data)